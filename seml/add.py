@@ -1,12 +1,14 @@
 import copy
+import itertools
 import os
 import datetime
 import logging
+from pymongo.write_concern import WriteConcern
 
 from seml.database import get_max_in_collection, get_collection
 from seml.config import remove_prepended_dashes, read_config, generate_configs, check_config
 from seml.sources import upload_sources, get_git_info
-from seml.utils import merge_dicts, s_if, make_hash, flatten, working_directory
+from seml.utils import merge_dicts, s_if, make_hash, flatten, chunker, working_directory
 from seml.settings import SETTINGS
 from seml.errors import ConfigError
 
@@ -30,28 +32,37 @@ def filter_experiments(collection, configurations):
     Returns
     -------
     filtered_configs: list of dicts
-        No longer contains configurations that are already in the database collection.
+        No longer contains configurations that are already in the database collection. The configurations themselves
+        are not modified, i.e., they keep their 'config_hash' entry.
 
     """
 
+    # Look up the config hashes in batches of `$in` queries instead of sending one query per configuration.
+    # Since we only project the config hash, the queries are covered by the index on it and do not load any documents.
+    config_hashes = [config['config_hash'] for config in configurations if 'config_hash' in config]
+    existing_hashes = set()
+    for config_hashes_chunk in chunker(config_hashes, 1000):
+        lookup_result = collection.find({'config_hash': {'$in': config_hashes_chunk}},
+                                        {'config_hash': 1, '_id': 0})
+        existing_hashes.update(x['config_hash'] for x in lookup_result)
+
     filtered_configs = []
     for config in configurations:
         if 'config_hash' in config:
-            config_hash = config['config_hash']
-            del config['config_hash']
-            lookup_result = collection.find_one({'config_hash': config_hash})
+            is_duplicate = config['config_hash'] in existing_hashes
         else:
+            # Without hashes we have to query each configuration separately, which is slow.
             lookup_dict = flatten({'config': config})
-            lookup_result = collection.find_one(lookup_dict)
+            is_duplicate = collection.find_one(lookup_dict, {'_id': 1}) is not None
 
-        if lookup_result is None:
+        if not is_duplicate:
             filtered_configs.append(config)
 
     return filtered_configs
 
 
 def add_configs(collection, seml_config, slurm_config, configs, source_files=None,
-                git_info=None):
+                git_info=None, batch_id=None):
     """Put the input configurations into the database.
 
     Parameters
@@ -63,11 +74,14 @@ def add_configs(collection, seml_config, slurm_config, configs, source_files=Non
     slurm_config: dict
         Settings for the Slurm job. See `start_experiments.start_slurm_job` for details.
     configs: list of dicts
-        Contains the parameter configurations.
+        Contains the parameter configurations. A 'config_hash' entry is removed from the configuration and stored
+        as the experiment's config hash; if it is missing, the hash is computed.
     source_files: (optional) list of tuples
         Contains the uploaded source files corresponding to the batch. Entries are of the form
         (object_id, relative_path)
     git_info: (Optional) dict containing information about the git repo status.
+    batch_id: (Optional) int
+        The batch ID of the configurations. If None, the next free batch ID in the collection is used.
 
     Returns
     -------
@@ -84,28 +98,40 @@ def add_configs(collection, seml_config, slurm_config, configs, source_files=Non
     else:
         start_id = start_id + 1
 
-    batch_id = get_max_in_collection(collection, "batch_id")
     if batch_id is None:
-        batch_id = 1
-    else:
-        batch_id = batch_id + 1
+        batch_id = get_max_in_collection(collection, "batch_id")
+        if batch_id is None:
+            batch_id = 1
+        else:
+            batch_id = batch_id + 1
 
     logging.info(f"Adding {len(configs)} configs to the database (batch-ID {batch_id}).")
 
     if source_files is not None:
         seml_config['source_files'] = source_files
-    db_dicts = [{'_id': start_id + ix,
+    # All configurations of a batch are added at the same time.
+    add_time = datetime.datetime.utcnow()
+    # Reuse the hashes computed for duplicate detection instead of hashing the configurations again.
+    configs_with_hashes = ((c, c.pop('config_hash', None) or make_hash(c)) for c in configs)
+    # The documents are created lazily, so that only one chunk of them is held in memory at a time.
+    db_dicts = ({'_id': _id,
                  'batch_id': batch_id,
                  'status': States.STAGED[0],
                  'seml': seml_config,
                  'slurm': slurm_config,
                  'config': c,
-                 'config_hash': make_hash(c),
+                 'config_hash': config_hash,
                  'git': git_info,
-                 'add_time': datetime.datetime.utcnow()}
-                for ix, c in enumerate(configs)]
+                 'add_time': add_time}
+                for _id, (c, config_hash) in zip(itertools.count(start_id), configs_with_hashes))
 
-    collection.insert_many(db_dicts)
+    if SETTINGS.DATABASE.FAST_INSERT:
+        collection = collection.with_options(write_concern=WriteConcern(w=0))
+    # The documents are independent of each other, so the server does not need to insert them in order.
+    db_dicts_chunk = list(itertools.islice(db_dicts, SETTINGS.DATABASE.INSERT_BATCH_SIZE))
+    while len(db_dicts_chunk) > 0:
+        collection.insert_many(db_dicts_chunk, ordered=False)
+        db_dicts_chunk = list(itertools.islice(db_dicts, SETTINGS.DATABASE.INSERT_BATCH_SIZE))
 
 def add_config_files(db_collection_name, config_files, force_duplicates, overwrite_params=None, no_hash=False, no_sanity_check=False,
                     no_code_checkpoint=False):
@@ -162,8 +188,8 @@ def add_config_file(db_collection_name, config_file, force_duplicates, overwrite
     config_file: path to the YAML configuration.
     force_duplicates: if True, disable duplicate detection.
     overwrite_params: optional flat dictionary to overwrite parameters in all configs.
-    no_hash: if True, disable hashing of the configurations for duplicate detection. This is much slower, so use only
-        if you have a good reason to.
+    no_hash: if True, do not use the hashes of the configurations for duplicate detection in the database. This is
+        much slower, so use only if you have a good reason to.
     no_sanity_check: if True, do not check the config for missing/unused arguments.
     no_code_checkpoint: if True, do not upload the experiment source code files to the MongoDB.
 
@@ -182,6 +208,10 @@ def add_config_file(db_collection_name, config_file, force_duplicates, overwrite
 
     configs = generate_configs(experiment_config, overwrite_params=overwrite_params)
     collection = get_collection(db_collection_name)
+    # Create an index on the config hash before looking up duplicates, and on the batch ID so that finding the
+    # maximum batch ID does not require a collection scan. If the indices are already present, this simply does nothing.
+    collection.create_index("config_hash")
+    collection.create_index("batch_id")
 
     batch_id = get_max_in_collection(collection, "batch_id")
     if batch_id is None:
@@ -212,17 +242,9 @@ def add_config_file(db_collection_name, config_file, force_duplicates, overwrite
         len_before = len(configs)
 
         # First, check for duplicates withing the experiment configurations from the file.
-        if not use_hash:
-            # slow duplicate detection without hashes
-            unique_configs = []
-            for c in configs:
-                if c not in unique_configs:
-                    unique_configs.append(c)
-            configs = unique_configs
-        else:
-            # fast duplicate detection using hashing.
-            configs_dict = {c['config_hash']: c for c in configs}
-            configs = [v for k, v in configs_dict.items()]
+        # We always use hashing for this, `no_hash` only affects the duplicate detection in the database.
+        configs_dict = {(c['config_hash'] if use_hash else make_hash(c)): c for c in configs}
+        configs = list(configs_dict.values())
 
         len_after_deduplication = len(configs)
         # Now, check for duplicate configurations in the database.
@@ -235,8 +257,6 @@ def add_config_file(db_collection_name, config_file, force_duplicates, overwrite
             logging.info(f"{len_after_deduplication - len_after} of {len_after_deduplication} "
                          f"experiment{s_if(len_before)} were already found in the database. They were not added again.")
 
-    # Create an index on the config hash. If the index is already present, this simply does nothing.
-    collection.create_index("config_hash")
     # Add the configurations to the database with STAGED status.
     if len(configs) > 0:
-        add_configs(collection, seml_config, slurm_config, configs, uploaded_files, git_info)
\ No newline at end of file
+        add_configs(collection, seml_config, slurm_config, configs, uploaded_files, git_info, batch_id)
\ No newline at end of file
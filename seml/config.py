@@ -18,6 +18,12 @@ from seml.settings import SETTINGS
 
 RESERVED_KEYS = ['grid', 'fixed', 'random']
 
+try:
+    # Use the libyaml C bindings for parsing if PyYAML was built with them; they are much faster.
+    from yaml import CFullLoader as FullLoader
+except ImportError:
+    from yaml import FullLoader
+
 
 def unpack_config(config):
     config = convert_parameter_collections(config)
@@ -59,14 +65,18 @@ def convert_parameter_collections(input_config: dict):
         del flattened_dict[k]
         # sub1.sub2.type ==> # sub1.sub2
         k = ".".join(k.split(".")[:-1])
-        parameter_collections_params = [param_key for param_key in flattened_dict.keys() if param_key.startswith(k)]
+        # sub1.sub2.params.p1 ==> sub1.sub2.p1, and sub1.sub2.params ==> sub1.sub2 for empty parameter collections
+        params_key = f"{k}.params"
+        params_prefix = f"{params_key}."
+        len_params_prefix = len(params_prefix)
+        parameter_collections_params = [param_key for param_key in flattened_dict.keys()
+                                        if param_key == params_key or param_key.startswith(params_prefix)]
         for p in parameter_collections_params:
-            if f"{k}.params" in p:
-                new_key = p.replace(f"{k}.params", k)
-                if new_key in flattened_dict:
-                    raise ConfigError(f"Could not convert parameter collections due to key collision: {new_key}.")
-                flattened_dict[new_key] = flattened_dict[p]
-                del flattened_dict[p]
+            new_key = k if p == params_key else f"{k}.{p[len_params_prefix:]}"
+            if new_key in flattened_dict:
+                raise ConfigError(f"Could not convert parameter collections due to key collision: {new_key}.")
+            flattened_dict[new_key] = flattened_dict[p]
+            del flattened_dict[p]
         parameter_collection_keys = [k for k in flattened_dict.keys()
                                      if flattened_dict[k] == "parameter_collection"]
     return unflatten(flattened_dict)
@@ -340,7 +350,7 @@ def convert_values(val):
     return val
 
 
-class YamlUniqueLoader(yaml.FullLoader):
+class YamlUniqueLoader(FullLoader):
     """
     Custom YAML loader that disallows duplicate keys
 
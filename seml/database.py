@@ -25,8 +25,27 @@ def get_mongo_client(db_name, host, port, username, password, **kwargs):
     return client
 
 
+# MongoDB clients of `get_database`, keyed by their connection settings.
+_mongo_clients = {}
+
+
 def get_database(db_name, host, port, username, password, **kwargs):
-    db = get_mongo_client(db_name, host, port, username, password, **kwargs)[db_name]
+    # The MongoClient is thread-safe and keeps a connection pool, so we reuse it for identical connection settings
+    # instead of connecting and authenticating again on every `get_collection` call.
+    # MongoClient is not fork-safe: a forked child process has to call `_mongo_clients.clear()` before
+    # accessing the database to get its own client.
+    client_key = (db_name, host, port, username, password, tuple(sorted(kwargs.items())))
+    try:
+        client = _mongo_clients.get(client_key)
+    except TypeError:
+        # Unhashable connection options (e.g. lists or dicts) can't be used as a cache key, so don't cache the client.
+        client_key = None
+        client = None
+    if client is None:
+        client = get_mongo_client(db_name, host, port, username, password, **kwargs)
+        if client_key is not None:
+            _mongo_clients[client_key] = client
+    db = client[db_name]
     return db
 
 
@@ -147,14 +166,14 @@ def get_max_in_collection(collection: Collection, field: str):
     max_val: the maximum value in the field.
     """
 
-    ndocs = collection.count_documents({})
     if field == "_id":
-        c = collection.find({}, {'_id': 1})
+        projection = {'_id': 1}
     else:
-        c = collection.find({}, {'_id': 1, field: 1})
-    b = c.sort(field, pymongo.DESCENDING).limit(1)
-    if ndocs != 0:
-        b_next = b.next()
+        projection = {'_id': 1, field: 1}
+    # A descending sort with limit 1 walks the index on the field (if present) and only returns a single document.
+    # An empty collection simply yields None, so there is no need for a separate count query.
+    b_next = collection.find_one({}, projection, sort=[(field, pymongo.DESCENDING)])
+    if b_next is not None:
         max_val = b_next.get(field)
     else:
         max_val = None
@@ -97,8 +97,9 @@ def main():
             help="Path to the YAML configuration file for the experiment.")
     parser_add.add_argument(
             '-nh', '--no-hash', action='store_true',
-            help="Do not use the hash of the config dictionary to filter out duplicates (by comparing all "
-                 "dictionary values individually). This is much slower, so use only if you have a good reason not to "
+            help="Do not use the hash of the config dictionary to filter out duplicates in the database (by "
+                 "comparing all dictionary values individually). Duplicates within the added configurations are "
+                 "still detected via hashing. This is much slower, so use only if you have a good reason not to "
                  "use the hash.")
     parser_add.add_argument(
             '-nsc', '--no-sanity-check', action='store_true',
@@ -7,6 +7,7 @@ from getpass import getpass
 import copy
 import time
 import gridfs
+from pymongo import UpdateOne
 
 from seml.config import check_config
 from seml.database import get_collection, build_filter_dict
@@ -41,7 +42,7 @@ def report_status(db_collection_name):
 
 
 def cancel_experiment_by_id(collection, exp_id, set_interrupted=True, slurm_dict=None, wait=False):
-    exp = collection.find_one({'_id': exp_id})
+    exp = collection.find_one({'_id': exp_id}, {'slurm': 1})
     if slurm_dict:
         exp['slurm'].update(slurm_dict)
 
@@ -138,18 +139,22 @@ def cancel_experiments(db_collection_name, sacred_id, filter_states, batch_id, f
             slurm_ids = set([(e['slurm']['array_id'], e['slurm']['task_id']) for e in exps])
             # set of experiment IDs to be cancelled.
             exp_ids = set([e['_id'] for e in exps])
-            to_cancel = set()
-
-            # iterate over slurm IDs to check which slurm jobs can be cancelled altogether
-            for (a_id, t_id) in slurm_ids:
-                # find experiments RUNNING under the slurm job
-                jobs_running = [e for e in exps
-                                if (e['slurm']['array_id'] == a_id and e['slurm']['task_id'] == t_id
-                                    and e['status'] in States.RUNNING)]
-                running_exp_ids = set(e['_id'] for e in jobs_running)
-                if len(running_exp_ids.difference(exp_ids)) == 0:
-                    # there are no running jobs in this slurm job that should not be canceled.
-                    to_cancel.add(f"{a_id}_{t_id}")
+
+            # find all experiments RUNNING or PENDING under these slurm jobs, including ones that are not to be
+            # cancelled. This is the same check as in `cancel_experiment_by_id`.
+            active_exps = collection.find({'slurm.array_id': {'$in': list({a_id for a_id, _ in slurm_ids})},
+                                           'status': {'$in': [*States.RUNNING, *States.PENDING]}},
+                                          {'_id': 1, 'slurm.array_id': 1, 'slurm.task_id': 1})
+            # set of slurm IDs in which a running experiment remains after cancelling.
+            slurm_ids_keep = set([(e['slurm']['array_id'], e['slurm']['task_id']) for e in active_exps
+                                  if e['_id'] not in exp_ids]) & slurm_ids
+            if len(slurm_ids_keep) > 0:
+                keep_str = ', '.join(sorted(f"{a_id}_{t_id}" for (a_id, t_id) in slurm_ids_keep))
+                logging.warning(f"Not cancelling Slurm job{s_if(len(slurm_ids_keep))} {keep_str}, since other "
+                                f"experiments are still running or pending in them. The cancelled experiments "
+                                f"in these jobs will keep running until the jobs finish.")
+            # slurm jobs for which no running experiment remains can be cancelled altogether.
+            to_cancel = set([f"{a_id}_{t_id}" for (a_id, t_id) in slurm_ids - slurm_ids_keep])
 
             # cancel all Slurm jobs for which no running experiment remains.
             if len(to_cancel) > 0:
@@ -202,7 +207,8 @@ def delete_experiments(db_collection_name, sacred_id, filter_states, batch_id, f
             experiment_files_to_delete.extend(get_experiment_files(exp))
         collection.delete_many(filter_dict)
     else:
-        exp = collection.find_one({'_id': sacred_id})
+        # Only fetch the fields we need, the full document may contain large results.
+        exp = collection.find_one({'_id': sacred_id}, {'batch_id': 1, 'experiment.sources': 1, 'artifacts': 1})
         if exp is None:
             raise MongoDBError(f"No experiment found with ID {sacred_id}.")
         else:
@@ -213,7 +219,6 @@ def delete_experiments(db_collection_name, sacred_id, filter_states, batch_id, f
             batch_ids_in_del = set([exp['batch_id']])
 
             # Collect sources uploaded by sacred.
-            exp = collection.find_one({'_id': sacred_id}, {'experiment.sources': 1, 'artifacts': 1})
             experiment_files_to_delete.extend(get_experiment_files(exp))
             collection.delete_one({'_id': sacred_id})
 
@@ -299,23 +304,28 @@ def detect_killed(db_collection_name, print_detected=True):
                             '$or': [{'slurm.array_id': {'$exists': True}}, {'slurm.id': {'$exists': True}}]})
     running_jobs = get_slurm_arrays_tasks()
     nkilled = 0
+    db_updates = []
     for exp in exps:
         exp_running = ('array_id' in exp['slurm'] and exp['slurm']['array_id'] in running_jobs
                        and (any(exp['slurm']['task_id'] in r for r in running_jobs[exp['slurm']['array_id']][0])
                             or exp['slurm']['task_id'] in running_jobs[exp['slurm']['array_id']][1]))
         if not exp_running:
             if 'stop_time' in exp:
-                collection.update_one({'_id': exp['_id']}, {'$set': {'status': States.INTERRUPTED[0]}})
+                db_updates.append(UpdateOne({'_id': exp['_id']}, {'$set': {'status': States.INTERRUPTED[0]}}))
             else:
                 nkilled += 1
-                collection.update_one({'_id': exp['_id']}, {'$set': {'status': States.KILLED[0]}})
+                exp_updates = {'status': States.KILLED[0]}
                 try:
                     with open(exp['seml']['output_file'], 'r') as f:
                         all_lines = f.readlines()
-                    collection.update_one({'_id': exp['_id']}, {'$set': {'fail_trace': all_lines[-4:]}})
+                    exp_updates['fail_trace'] = all_lines[-4:]
                 except IOError:
                     # If the experiment is cancelled before starting (e.g. when still queued), there is not output file.
                     logging.verbose(f"File {exp['seml']['output_file']} could not be read.")
+                db_updates.append(UpdateOne({'_id': exp['_id']}, {'$set': exp_updates}))
+    if len(db_updates) > 0:
+        # Send all updates in a single round trip.
+        collection.bulk_write(db_updates, ordered=False)
     if print_detected:
         logging.info(f"Detected {nkilled} externally killed experiment{s_if(nkilled)}.")
 
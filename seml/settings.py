@@ -18,7 +18,12 @@ SETTINGS = munchify(
 
         "DATABASE": {
             # location of the MongoDB config. Default: $HOME/.config/seml/monogdb.config
-            "MONGODB_CONFIG_PATH": Path.home() / ".config/seml/mongodb.config"
+            "MONGODB_CONFIG_PATH": Path.home() / ".config/seml/mongodb.config",
+            # Add experiments with unacknowledged writes (write concern w=0).
+            # This is faster for large batches, but failed inserts (e.g. due to a lost connection) go unnoticed.
+            "FAST_INSERT": False,
+            # Number of experiments that are sent to the MongoDB in a single `insert_many` call.
+            "INSERT_BATCH_SIZE": 1000,
         },
         "SLURM_DEFAULT": {
             'experiments_per_job': 1,
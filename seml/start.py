@@ -12,6 +12,7 @@ import time
 import copy
 import uuid
 from tqdm.auto import tqdm
+from pymongo import UpdateMany
 
 from seml.database import get_collection, build_filter_dict
 from seml.sources import load_sources_from_db
@@ -246,18 +247,23 @@ def start_sbatch_job(collection, exp_array, unobserved=False, name=None,
         exit(1)
 
     slurm_array_job_id = int(output.split(b' ')[-1])
+    db_updates = []
     for task_id, chunk in enumerate(exp_array):
+        if not unobserved:
+            # The update is identical for all experiments in the same task.
+            db_updates.append(UpdateMany(
+                    {'_id': {'$in': [exp['_id'] for exp in chunk]}},
+                    {'$set': {
+                        'status': States.PENDING[0],
+                        'slurm.array_id': slurm_array_job_id,
+                        'slurm.task_id': task_id,
+                        'slurm.sbatch_options': sbatch_options,
+                        'seml.output_file': f"{output_dir_path}/{name}_{slurm_array_job_id}_{task_id}.out"}}))
         for exp in chunk:
-            if not unobserved:
-                collection.update_one(
-                        {'_id': exp['_id']},
-                        {'$set': {
-                            'status': States.PENDING[0],
-                            'slurm.array_id': slurm_array_job_id,
-                            'slurm.task_id': task_id,
-                            'slurm.sbatch_options': sbatch_options,
-                            'seml.output_file': f"{output_dir_path}/{name}_{slurm_array_job_id}_{task_id}.out"}})
             logging.verbose(f"Started experiment with array job ID {slurm_array_job_id}, task ID {task_id}.")
+    if len(db_updates) > 0:
+        # Send all updates in a single round trip.
+        collection.bulk_write(db_updates, ordered=False)
     os.remove(path)
 
 
@@ -757,9 +763,9 @@ def print_command(db_collection_name, sacred_id, batch_id, filter_dict, num_exps
 
     logging.info("\n********** All raw commands **********")
     logging.root.setLevel(orig_level)
+    verbose = logging.root.level <= logging.VERBOSE
     for exp in exps_list:
-        interpreter, exe, config = get_command_from_exp(
-                exp, collection.name, verbose=logging.root.level <= logging.VERBOSE)
+        interpreter, exe, config = get_command_from_exp(exp, collection.name, verbose=verbose)
         logging.info(get_shell_command(interpreter, exe, config, env=env_dict))
 
 
@@ -1,7 +1,8 @@
-from collections.abc import Iterable
+from collections.abc import Iterable, MutableMapping
 from contextlib import contextmanager
 from pathlib import Path
 import logging
+import hashlib
 import json
 import copy
 import os
@@ -106,7 +107,8 @@ def unflatten(dictionary: dict, sep: str = '.', recursive: bool = False, levels=
 def flatten(dictionary: dict, parent_key: str = '', sep: str = '.'):
     """
     Flatten a nested dictionary, e.g. {'a':{'b': 2}, 'c': 3} becomes {'a.b':2, 'c':3}.
-    From https://stackoverflow.com/questions/6027558/flatten-nested-dictionaries-compressing-keys
+    The nested dictionaries are traversed iteratively with a stack of item iterators, which avoids recursion and
+    intermediate dictionaries while preserving the key order of the recursive version.
 
     Parameters
     ----------
@@ -118,21 +120,22 @@ def flatten(dictionary: dict, parent_key: str = '', sep: str = '.'):
     -------
     flattened dictionary.
     """
-    import collections
-
-    items = []
-    for k, v in dictionary.items():
-        k = str(k)
-        new_key = parent_key + sep + k if parent_key else k
-        if isinstance(v, collections.abc.MutableMapping):
+    flattened = {}
+    stack = [(parent_key, iter(dictionary.items()))]
+    while len(stack) > 0:
+        prefix, items = stack[-1]
+        for k, v in items:
+            k = str(k)
+            new_key = prefix + sep + k if prefix else k
             # This covers the edge case that someone supplies an empty dictionary as parameter
-            if len(v) == 0:
-                items.append((new_key, v))
-            else:
-                items.extend(flatten(v, new_key, sep=sep).items())
+            if isinstance(v, MutableMapping) and len(v) > 0:
+                # Descend into the sub-dictionary and continue with the remaining items afterwards.
+                stack.append((new_key, iter(v.items())))
+                break
+            flattened[new_key] = v
         else:
-            items.append((new_key, v))
-    return dict(items)
+            stack.pop()
+    return flattened
 
 
 def chunker(seq, size):
@@ -204,7 +207,6 @@ def make_hash(d: dict):
     -------
     hash (hex encoded) of the input dictionary.
     """
-    import hashlib
     return hashlib.md5(json.dumps(d, sort_keys=True).encode("utf-8")).hexdigest()
 
 
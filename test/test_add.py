@@ -0,0 +1,40 @@
+import unittest
+from unittest import mock
+
+from seml import add
+from seml.settings import SETTINGS
+
+
+class TestAddConfigs(unittest.TestCase):
+
+    def setUp(self):
+        self.collection = mock.MagicMock()
+        self.fast_collection = self.collection.with_options.return_value
+        self.configs = [{'a': 1}, {'a': 2}, {'a': 3}]
+
+    def add_configs(self, fast_insert):
+        with mock.patch.dict(SETTINGS.DATABASE, {'FAST_INSERT': fast_insert, 'INSERT_BATCH_SIZE': 2}):
+            add.add_configs(self.collection, {'executable': 'exp.py'}, {}, self.configs, batch_id=1)
+
+    def test_insert(self):
+        self.collection.find_one.return_value = None
+        self.add_configs(fast_insert=False)
+        self.collection.with_options.assert_not_called()
+        self.assertEqual(self.collection.insert_many.call_count, 2)
+        for call in self.collection.insert_many.call_args_list:
+            self.assertEqual(call.kwargs, {'ordered': False})
+        inserted = [doc for call in self.collection.insert_many.call_args_list for doc in call.args[0]]
+        self.assertEqual([doc['_id'] for doc in inserted], [1, 2, 3])
+        self.assertEqual([doc['config'] for doc in inserted], self.configs)
+
+    def test_fast_insert(self):
+        self.collection.find_one.return_value = None
+        self.add_configs(fast_insert=True)
+        write_concern = self.collection.with_options.call_args.kwargs['write_concern']
+        self.assertEqual(write_concern.document, {'w': 0})
+        self.collection.insert_many.assert_not_called()
+        self.assertEqual(self.fast_collection.insert_many.call_count, 2)
+        for call in self.fast_collection.insert_many.call_args_list:
+            # PyMongo does not allow bypass_document_validation with unacknowledged writes.
+            self.assertNotIn('bypass_document_validation', call.kwargs)
+            self.assertEqual(call.kwargs, {'ordered': False})
@@ -90,6 +90,23 @@ class TestParseConfigDicts(unittest.TestCase):
         }
         self.assertEqual(converted, expected)
 
+    def test_convert_parameter_collections_edge_cases(self):
+        # Empty parameter collections do not leave a 'params' key behind.
+        config_dict = {'a': {'type': 'parameter_collection', 'params': {}}}
+        self.assertEqual(config.convert_parameter_collections(config_dict), {'a': {}})
+
+        # Only keys starting with '<collection>.params.' are moved into the collection.
+        config_dict = {
+            'a': {'type': 'parameter_collection', 'params': {'x': 1}},
+            'ab': {'a': {'params': 2}},
+            'a.paramsX': {'y': 3},
+        }
+        expected = {
+            'a': {'x': 1, 'paramsX': {'y': 3}},
+            'ab': {'a': {'params': 2}},
+        }
+        self.assertEqual(config.convert_parameter_collections(config_dict), expected)
+
     def test_unpack_config_dict(self):
         config_dict = self.load_config_dict(self.SIMPLE_CONFIG_WITH_PARAMETER_COLLECTIONS)
         unpacked, next_level = config.unpack_config(config_dict)
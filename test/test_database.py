@@ -0,0 +1,32 @@
+import unittest
+from unittest import mock
+
+from seml import database
+
+
+class TestGetDatabase(unittest.TestCase):
+
+    def setUp(self):
+        database._mongo_clients.clear()
+        self.addCleanup(database._mongo_clients.clear)
+        patcher = mock.patch.object(database, 'get_mongo_client', side_effect=lambda *args, **kwargs: mock.MagicMock())
+        self.get_mongo_client = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.config = {'db_name': 'db', 'host': 'localhost', 'port': '27017', 'username': 'user',
+                       'password': 'password', 'directConnection': False}
+
+    def test_reuse_client(self):
+        db1 = database.get_database(**self.config)
+        db2 = database.get_database(**self.config)
+        self.assertEqual(self.get_mongo_client.call_count, 1)
+        self.assertIs(db1, db2)
+        database.get_database(**{**self.config, 'host': 'otherhost'})
+        self.assertEqual(self.get_mongo_client.call_count, 2)
+
+    def test_unhashable_options(self):
+        config = {**self.config, 'compressors': ['zstd', 'zlib']}
+        database.get_database(**config)
+        database.get_database(**config)
+        # Clients with unhashable options are not cached, but still work.
+        self.assertEqual(self.get_mongo_client.call_count, 2)
+        self.assertEqual(self.get_mongo_client.call_args.kwargs['compressors'], ['zstd', 'zlib'])
@@ -0,0 +1,41 @@
+import unittest
+from unittest import mock
+
+from seml import manage
+from seml.settings import SETTINGS
+
+States = SETTINGS.STATES
+
+
+class TestCancelExperiments(unittest.TestCase):
+
+    def cancel(self, filtered_exps, active_exps):
+        collection = mock.MagicMock()
+        collection.count_documents.return_value = len(filtered_exps)
+        collection.find.side_effect = [filtered_exps, active_exps]
+        with mock.patch.object(manage, 'get_collection', return_value=collection), \
+                mock.patch.object(manage.subprocess, 'run') as run:
+            manage.cancel_experiments('collection', None, States.STAGED, None, None, yes=True)
+        scancel_cmds = [call.args[0] for call in run.call_args_list]
+        return collection, scancel_cmds
+
+    def test_cancel_jobs_without_other_experiments(self):
+        exps = [{'_id': 1, 'status': States.RUNNING[0], 'slurm': {'array_id': 10, 'task_id': 0}},
+                {'_id': 2, 'status': States.RUNNING[0], 'slurm': {'array_id': 10, 'task_id': 1}}]
+        collection, scancel_cmds = self.cancel(exps, exps)
+        self.assertEqual(len(scancel_cmds), 1)
+        self.assertEqual(set(scancel_cmds[0].split()[1:]), {'10_0', '10_1'})
+        collection.update_many.assert_called_once()
+
+    def test_keep_jobs_with_other_active_experiments(self):
+        exps = [{'_id': 1, 'status': States.RUNNING[0], 'slurm': {'array_id': 10, 'task_id': 0}},
+                {'_id': 2, 'status': States.RUNNING[0], 'slurm': {'array_id': 10, 'task_id': 1}}]
+        # Experiment 3 is not cancelled and shares Slurm job 10_1 with experiment 2.
+        active_exps = exps + [{'_id': 3, 'slurm': {'array_id': 10, 'task_id': 1}}]
+        with self.assertLogs(level='WARNING') as logs:
+            collection, scancel_cmds = self.cancel(exps, active_exps)
+        self.assertEqual(scancel_cmds, ['scancel 10_0'])
+        self.assertIn('10_1', logs.output[0])
+        # The active experiments include PENDING ones, as in `cancel_experiment_by_id`.
+        active_filter = collection.find.call_args_list[1].args[0]
+        self.assertEqual(set(active_filter['status']['$in']), {*States.RUNNING, *States.PENDING})
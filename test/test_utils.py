@@ -221,3 +221,42 @@ class TestUnflattenDictionaries(unittest.TestCase):
         expected5 = utils.unflatten(flattened, sep='.', recursive=False, levels=[2])
         self.assertEqual(unflattened5, expected5)
 
+
+class TestFlattenDictionaries(unittest.TestCase):
+
+    def test_basic(self):
+        nested = {'a': {'b': {'c': 111}, 'd': 22}, 'e': 3}
+        flattened = utils.flatten(nested)
+        expected = {'a.b.c': 111, 'a.d': 22, 'e': 3}
+        self.assertEqual(flattened, expected)
+        # The key order of the nested dictionary is preserved.
+        self.assertEqual(list(flattened.keys()), list(expected.keys()))
+
+    def test_empty(self):
+        self.assertEqual(utils.flatten({}), {})
+        # Empty sub-dictionaries are kept as values.
+        self.assertEqual(utils.flatten({'a': {}, 'b': {'c': {}}}), {'a': {}, 'b.c': {}})
+
+    def test_parent_key_and_separator(self):
+        nested = {'a': {'b': 1}, 2: 'x'}
+        flattened = utils.flatten(nested, parent_key='config', sep='/')
+        expected = {'config/a/b': 1, 'config/2': 'x'}
+        self.assertEqual(flattened, expected)
+
+    def test_inverse_of_unflatten(self):
+        flattened = {'a.b.c': 111, 'a.d': 22, 'e.f': [1, 2], 'g': None}
+        self.assertEqual(utils.flatten(utils.unflatten(flattened)), flattened)
+
+
+class TestMakeHash(unittest.TestCase):
+
+    def test_key_order_independent(self):
+        d1 = {'a': 1, 'b': {'c': 2, 'd': [3, 4]}}
+        d2 = {'b': {'d': [3, 4], 'c': 2}, 'a': 1}
+        self.assertEqual(utils.make_hash(d1), utils.make_hash(d2))
+        self.assertNotEqual(utils.make_hash(d1), utils.make_hash({'a': 1}))
+
+    def test_stable(self):
+        # Config hashes are stored in the database for duplicate detection, so they must not change.
+        d = {'b': {'c': [1, 2.5], 'd': 'x'}, 'a': None}
+        self.assertEqual(utils.make_hash(d), '64449b11156854ae251ac406950de64f')